@@ -0,0 +1,751 @@
+import micropython
+import network
+import _thread
+import ntptime
+import struct
+import urequests
+import time  # Changed from utime to time
+from machine import Pin, I2C, ADC, UART, Timer
+
+
+# Big-endian signed 16-bit register layouts, decoded in C by struct
+S16_FMT = '>h'
+MOTION_FMT = '>7h'  # ax, ay, az, temp, gx, gy, gz
+_unpack = struct.unpack
+_unpack_from = struct.unpack_from
+
+
+@micropython.viper
+def read_adc0() -> int:
+    """
+    Reads ADC channel 0 (GP26) directly from the RP2040 ADC registers.
+
+    machine.ADC(26) must have been created first to set up the pin and the ADC.
+
+    Returns:
+        The raw 12-bit conversion result.
+    """
+    adc = ptr32(0x4004c000)  # ADC base: CS at word 0, RESULT at word 1
+    adc[0] = 0x5  # EN | START_ONCE, AINSEL = 0
+    while not (adc[0] & 0x100):  # Wait for READY
+        pass
+    return adc[1] & 0xfff
+
+
+# MPU6050 Definition
+class MPU6050:
+    def __init__(self, i2c, addr=0x68, recover=None):
+        """
+        Initializes the MPU6050 sensor.
+
+        Args:
+            i2c: The I2C object.
+            addr: The I2C address of the MPU6050.
+            recover: Optional function that clears a stuck bus and returns a new I2C object.
+        """
+        self.addr = addr
+        self._recover = recover
+        self._err_count = 0
+        self._recover_delay = I2C_RECOVER_MIN_MS
+        self._next_recover = time.ticks_ms()
+        self._buf = bytearray(14)  # Reused by every burst read
+        self._bind(i2c)
+        self._wake()
+
+    def _bind(self, i2c):
+        """Binds the I2C read methods once, as they are used on every sample."""
+        self.i2c = i2c
+        self._readfrom_mem = i2c.readfrom_mem
+        self._readfrom_mem_into = i2c.readfrom_mem_into
+
+    def _wake(self):
+        """Wakes up the MPU6050 and sets self.initialized."""
+        try:
+            self.i2c.writeto_mem(self.addr, 0x6B, b'\x00')  # Wake up the MPU6050
+        except Exception as e:
+            print(f"Error initializing MPU6050: {e}")
+            self.initialized = False
+            return
+        self.initialized = True
+
+    def _i2c_error(self, error=None):
+        """
+        Counts a failed read and recovers the bus after I2C_MAX_ERRORS in a row.
+
+        Only the first error of a run is logged, and recoveries back off so a
+        missing sensor does not flood the log or stall sampling.
+
+        Args:
+            error: The exception raised by the read, if any.
+        """
+        if self._err_count == 0 and error is not None:
+            print(f"Error reading motion data: {error}")
+        self._err_count += 1
+        if self._err_count > I2C_MAX_ERRORS and time.ticks_diff(time.ticks_ms(), self._next_recover) >= 0:
+            self._i2c_recover()
+
+    def _i2c_recover(self):
+        """Clears a stuck I2C bus and wakes the MPU6050 again."""
+        print(f"Recovering I2C bus after {self._err_count} failed reads...")
+        if self._recover:
+            self._bind(self._recover())
+        self._wake()
+        # Reset by the next successful read; doubles while recovery keeps failing
+        self._next_recover = time.ticks_add(time.ticks_ms(), self._recover_delay)
+        self._recover_delay = min(self._recover_delay * 2, I2C_RECOVER_MAX_MS)
+
+    def read_raw_data(self, reg):
+        """
+        Reads raw data from the MPU6050.
+
+        Args:
+            reg: The register address to read from.
+
+        Returns:
+            The raw data (16-bit signed integer).
+        """
+        if not self.initialized:
+            return 0
+        return _unpack(S16_FMT, self._readfrom_mem(self.addr, reg, 2))[0]
+
+    def get_accel_data(self):
+        """
+        Gets the accelerometer data from the MPU6050.
+
+        Returns:
+            A tuple containing the x, y, and z accelerometer values in g, or None on error.
+        """
+        if not self.initialized:
+            return None
+        try:
+            ax = self.read_raw_data(0x3B) / 16384.0
+            ay = self.read_raw_data(0x3D) / 16384.0
+            az = self.read_raw_data(0x3F) / 16384.0
+            return (ax, ay, az)
+        except Exception as e:
+            print(f"Error reading accelerometer data: {e}")
+            return None
+
+    def get_gyro_data(self):
+        """
+        Gets the gyroscope data from the MPU6050.
+
+        Returns:
+            A tuple containing the x, y, and z gyroscope values in degrees per second, or None on error.
+        """
+        if not self.initialized:
+            return None
+        try:
+            gx = self.read_raw_data(0x43) / 131.0
+            gy = self.read_raw_data(0x45) / 131.0
+            gz = self.read_raw_data(0x47) / 131.0
+            return (gx, gy, gz)
+        except Exception as e:
+            print(f"Error reading gyroscope data: {e}")
+            return None
+
+    def get_motion_data(self):
+        """
+        Gets the accelerometer and gyroscope data in a single burst read.
+
+        Reads registers 0x3B..0x48 (accel, temperature, gyro) in one I2C
+        transaction instead of six separate 2-byte reads, into a buffer
+        allocated once in __init__.
+
+        Repeated failures trigger a bus recovery instead of failing forever.
+
+        Returns:
+            A tuple (ax, ay, az, gx, gy, gz) with accel in g and gyro in degrees
+            per second, or None on error.
+        """
+        if not self.initialized:
+            self._i2c_error()
+            if not self.initialized:  # A successful recovery reads this sample
+                return None
+        try:
+            buf = self._buf
+            self._readfrom_mem_into(self.addr, 0x3B, buf)
+            ax, ay, az, _temp, gx, gy, gz = _unpack_from(MOTION_FMT, buf)
+        except OSError as e:
+            self._i2c_error(e)
+            return None
+        if self._err_count:
+            self._err_count = 0
+            self._recover_delay = I2C_RECOVER_MIN_MS
+        return (ax / 16384.0, ay / 16384.0, az / 16384.0,
+                gx / 131.0, gy / 131.0, gz / 131.0)
+
+
+def make_i2c():
+    """Creates the I2C bus for the MPU6050."""
+    return I2C(I2C_ID, scl=Pin(I2C_SCL), sda=Pin(I2C_SDA), timeout=I2C_TIMEOUT_US)
+
+
+def recover_i2c_bus():
+    """
+    Clears a stuck I2C bus and recreates it.
+
+    Clocks SCL 9 times so a slave holding SDA low can finish its byte, then
+    sends a STOP condition.
+
+    Returns:
+        A new I2C object.
+    """
+    Pin(I2C_SDA, Pin.IN, Pin.PULL_UP)
+    scl = Pin(I2C_SCL, Pin.OPEN_DRAIN, value=1)
+    for _ in range(9):
+        scl.value(0)
+        time.sleep_us(5)
+        scl.value(1)
+        time.sleep_us(5)
+    sda = Pin(I2C_SDA, Pin.OPEN_DRAIN, value=0)  # STOP: SDA rises while SCL is high
+    time.sleep_us(5)
+    sda.value(1)
+    return make_i2c()
+
+
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def get_time_from_google():
+    """
+    Gets the current time from Google's HTTP headers and converts it to IST.
+    Handles errors.
+
+    Returns:
+        A timestamp (seconds since epoch) on success, None on failure.
+    """
+    try:
+        response = urequests.get("http://www.google.com")
+        date_str = response.headers.get("Date")  # 'Thu, 15 May 2025 10:25:39 GMT'
+        response.close()
+        if not date_str:
+            print("Failed to get date from headers.")
+            return None
+
+        # Parse date string; the token order is fixed by RFC 7231
+        parts = date_str.split()
+        day = int(parts[1])
+        month = MONTHS.index(parts[2]) + 1
+        year = int(parts[3])
+        clock = parts[4]  # 'HH:MM:SS'
+        h, m, s = int(clock[0:2]), int(clock[3:5]), int(clock[6:8])
+
+        # Convert to seconds since epoch (UTC)
+        utc_tuple = (year, month, day, h, m, s, 0, 0)
+        utc_seconds = time.mktime(utc_tuple)  # Use time.mktime
+
+        # Add IST offset (5 hours 30 minutes = 19800 seconds)
+        ist_seconds = utc_seconds + IST_OFFSET
+        return ist_seconds
+    except Exception as e:
+        print("Error getting time from Google:", e)
+        return None
+
+
+def sync_time():
+    """
+    Syncs the local clock once via NTP, falling back to Google's HTTP headers.
+
+    After a successful sync, current_time() needs no network access.
+
+    Returns:
+        True on success, False on failure.
+    """
+    global clock_offset
+    try:
+        ntptime.settime()  # Sets the RTC to UTC
+        clock_offset = IST_OFFSET
+        return True
+    except Exception as e:
+        print("Error syncing time via NTP:", e)
+    google_time = get_time_from_google()
+    if google_time is None:
+        return False
+    clock_offset = google_time - time.time()
+    return True
+
+
+def current_time():
+    """
+    Gets the current IST time from the local clock.
+
+    Returns:
+        A timestamp (seconds since epoch), or None if the clock was never synced.
+    """
+    if clock_offset is None:
+        return None
+    return time.time() + clock_offset
+
+
+
+IST_OFFSET = 19800  # 5 hours 30 minutes
+
+# WiFi and Telegram
+SSID = "WIFI provider name"
+PASSWORD = "password"
+BOT_TOKEN = "botToken"  # Replace with your bot token
+CHAT_ID = 6046574860
+
+# Telegram request parts, built once
+TG_URL = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
+TG_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+TG_PAYLOAD_PREFIX = f"chat_id={CHAT_ID}&text="
+FALL_TEMPLATE = (
+    "Helmet Fall Detected!\n"
+    "Bike Start Time: {}\n"
+    "Fall Detected Time: {}\n"
+    "Location: http://maps.google.com/?q={},{}\n"
+    "Acceleration: {:.2f} m/s^2\n"
+    "Peak Acceleration (last 1 s): {:.2f} m/s^2\n"
+    "Gyroscope: {:.2f} deg/s\n"
+    "Sound: {}\n"
+)
+URL_SAFE = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_.~"
+
+# Thresholds and GPIO Setup
+ACC_THRESHOLD = 1
+GYRO_THRESHOLD = 1
+SOUND_THRESHOLD = 1000
+GPS_TIMEOUT = 10  # Maximum age of a GPS fix in seconds
+FALLBACK_LAT = 11.0245  # Reported when there is no recent GPS fix
+FALLBACK_LON = 77.00025
+GPS_POLL_MS = 100
+GPS_MAX_LINE = 128  # NMEA sentences are at most 82 characters
+GPS_RXBUF = 1024  # ~1 s of NMEA at 9600 baud, so stalls never overflow the UART
+SAMPLE_MS = 10  # Sensor sampling period (100 Hz)
+PRINT_MS = 2000  # Status print period
+SNAPSHOT_COUNT = 100  # Samples kept for the alert message (~1 s at 100 Hz)
+ALERT_COOLDOWN_MS = 15000  # Status output pauses this long after the alert
+BUZZER_DURATION = 4  # Seconds on, then seconds off, per beep
+BUZZER_BEEPS = 10
+
+# Squared thresholds, so the per-sample check needs no square root
+ACC_THRESH_SQ = (ACC_THRESHOLD / 9.8) ** 2  # Accel is sampled in g
+GYRO_THRESH_SQ = GYRO_THRESHOLD ** 2
+
+I2C_ID = 0
+I2C_SCL = 1
+I2C_SDA = 0
+I2C_TIMEOUT_US = 10000  # Fail fast instead of hanging on a stuck bus
+I2C_MAX_ERRORS = 5  # Failed reads in a row before the bus is recovered
+I2C_RECOVER_MIN_MS = 100  # Wait after a recovery attempt, doubled on each failed one
+I2C_RECOVER_MAX_MS = 10000
+
+buzzer = Pin(15, Pin.OUT)
+buzzer_timer = Timer()
+buzzer_toggles = 0
+# Sensor Setup
+i2c = make_i2c()
+mpu = MPU6050(i2c, recover=recover_i2c_bus)
+mic = ADC(26)  # Sets up GP26 and the ADC for read_adc0()
+gps_uart = UART(1, baudrate=9600, tx=Pin(4), rx=Pin(5), rxbuf=GPS_RXBUF)
+gps_timer = Timer()
+
+bike_start_time = None
+clock_offset = None  # Seconds to add to time.time() to get IST, set by sync_time()
+sync_attempted = False
+is_wifi_connected = False
+
+# Ring buffer of recent (ticks_ms, acc_sq, gyro_sq, sound) samples, only touched by
+# the sensor core. A plain list, as older MicroPython builds cannot iterate a deque.
+snapshots = [(0, 0, 0, 0)] * SNAPSHOT_COUNT
+snapshot_index = 0
+
+# Fall reported by the sensor core, guarded by fall_lock. fall_detected latches
+# after the first report so only one alert is ever sent.
+fall_lock = _thread.allocate_lock()
+fall_event = None
+fall_detected = False
+
+# Latest GPS fix, updated in the background by poll_gps()
+gps_pending = b""
+last_lat = None
+last_lon = None
+last_fix_ts = None
+
+
+
+def connect_wifi(ssid, password):
+    """
+    Connects to WiFi.  Does NOT get the time.
+
+    Args:
+        ssid: The WiFi SSID.
+        password: The WiFi password.
+
+    Returns:
+        True on success, False on failure.
+    """
+    global is_wifi_connected
+    wlan = network.WLAN(network.STA_IF)
+    wlan.active(True)
+    if not wlan.isconnected():
+        print('Connecting to WiFi...')
+        wlan.connect(ssid, password)
+        for _ in range(20):
+            if wlan.isconnected():
+                break
+            time.sleep(0.5)
+    if wlan.isconnected():
+        print("Connected:", wlan.ifconfig())
+        is_wifi_connected = True
+        return True
+    else:
+        print("WiFi connection failed")
+        is_wifi_connected = False
+        return False
+
+
+
+def url_encode(text):
+    """
+    Percent-encodes text for a form-encoded request body.
+
+    Args:
+        text: The text to encode.
+
+    Returns:
+        The encoded text.
+    """
+    return "".join(chr(b) if chr(b) in URL_SAFE else "%{:02X}".format(b)
+                   for b in text.encode())
+
+
+
+def send_telegram_alert(message):
+    """
+    Sends a Telegram alert message to CHAT_ID.
+
+    Args:
+        message: The message to send.
+    """
+    response = None
+    try:
+        response = urequests.post(TG_URL, data=TG_PAYLOAD_PREFIX + url_encode(message), headers=TG_HEADERS)
+        print("Telegram response:", response.text)
+    except Exception as e:
+        print("Error sending message:", e)
+    finally:
+        if response:
+            response.close()
+
+
+
+@micropython.native
+def convert_to_degrees(raw):
+    """Converts raw GPS coordinates to degrees.
+
+    Args:
+        raw: The raw GPS coordinate string.
+
+    Returns:
+        The coordinate in degrees, or None on error.
+    """
+    try:
+        if not raw or len(raw) < 5:
+            return None
+        degrees = int(raw[:2])
+        minutes = float(raw[2:]) / 60.0
+        return degrees + minutes
+    except Exception as e:
+        print("Convert error:", e)
+        return None
+
+
+
+def parse_gpgga(line):
+    """
+    Parses a GPGGA sentence into a location.
+
+    Args:
+        line: The raw NMEA sentence (bytes).
+
+    Returns:
+        A tuple containing the latitude and longitude, or None if the sentence has no fix.
+    """
+    try:
+        parts = line.decode().strip().split(",")
+        if len(parts) > 5 and parts[2] and parts[4]:
+            lat = convert_to_degrees(parts[2])
+            lon = convert_to_degrees(parts[4])
+            if lat is not None and lon is not None:
+                if parts[3] == 'S':
+                    lat = -lat
+                if parts[5] == 'W':
+                    lon = -lon
+                return (lat, lon)
+    except Exception as e:
+        print(f"Error processing GPS data: {e}, line: {line}")
+    return None
+
+
+
+def poll_gps(timer=None):
+    """
+    Drains the GPS UART without blocking and keeps the latest fix.
+
+    Runs periodically from gps_timer. Incomplete sentences are kept until
+    the rest of the line arrives.
+
+    Args:
+        timer: The Timer that triggered the call (unused).
+    """
+    global gps_pending, last_lat, last_lon, last_fix_ts
+    n = gps_uart.any()
+    if not n:
+        return
+    lines = (gps_pending + gps_uart.read(n)).split(b"\r\n")
+    gps_pending = lines.pop()
+    if len(gps_pending) > GPS_MAX_LINE:
+        gps_pending = b""  # Garbage without a line ending
+    for line in lines:
+        if b"GPGGA" in line:
+            loc = parse_gpgga(line)
+            if loc:
+                last_lat, last_lon = loc
+                last_fix_ts = time.ticks_ms()
+
+
+
+def get_gps_location(max_age=GPS_TIMEOUT):
+    """
+    Gets the latest GPS location collected by poll_gps. Does not block.
+
+    Args:
+        max_age: The maximum age of the fix in seconds.
+
+    Returns:
+        A tuple containing the latitude and longitude, or None if there is no recent fix.
+    """
+    if last_fix_ts is None or time.ticks_diff(time.ticks_ms(), last_fix_ts) > max_age * 1000:
+        return None
+    return (last_lat, last_lon)
+
+
+
+def buzzer_tick(timer):
+    """
+    Toggles the buzzer from buzzer_timer, stopping it after BUZZER_BEEPS beeps.
+
+    Args:
+        timer: The Timer that triggered the call.
+    """
+    global buzzer_toggles
+    buzzer.toggle()
+    buzzer_toggles += 1
+    if buzzer_toggles >= 2 * BUZZER_BEEPS - 1:  # Last toggle turns it off
+        timer.deinit()
+
+
+
+def start_buzzer():
+    """Starts the buzzer and returns immediately; buzzer_timer switches it on and off."""
+    global buzzer_toggles
+    buzzer_timer.deinit()
+    buzzer_toggles = 0
+    buzzer.value(1)
+    buzzer_timer.init(period=BUZZER_DURATION * 1000, mode=Timer.PERIODIC, callback=buzzer_tick)
+
+
+
+@micropython.native
+def check_conditions():
+    """
+    Checks if fall conditions are met based on accelerometer, gyroscope, and sound sensor data.
+    Every sample is also recorded in the snapshots ring buffer.
+
+    Returns:
+        A tuple containing:
+            - True if fall conditions are met, False otherwise.
+            - The squared acceleration magnitude (in g^2).
+            - The squared gyroscope magnitude (in (deg/s)^2).
+            - The sound level.
+    """
+    global snapshot_index
+    motion = mpu.get_motion_data()
+    if not motion:
+        return False, 0, 0, 0
+    ax, ay, az, gx, gy, gz = motion
+    acc_sq = ax * ax + ay * ay + az * az
+    gyro_sq = gx * gx + gy * gy + gz * gz
+    sound = read_adc0() << 4  # Same 16-bit scale as ADC.read_u16()
+    snapshots[snapshot_index] = (time.ticks_ms(), acc_sq, gyro_sq, sound)
+    snapshot_index = (snapshot_index + 1) % SNAPSHOT_COUNT
+    all_met = acc_sq > ACC_THRESH_SQ and gyro_sq > GYRO_THRESH_SQ and sound > SOUND_THRESHOLD
+    return all_met, acc_sq, gyro_sq, sound
+
+
+
+def is_bike_on():
+    """
+    Checks if the bike is on (simulated by WiFi connection).  Syncs the clock on first connection.
+
+    Returns:
+        True if the bike is on, False otherwise.
+    """
+    global bike_start_time, is_wifi_connected, sync_attempted
+    if not is_wifi_connected:
+        is_wifi_connected = connect_wifi(SSID, PASSWORD)  # Connect only, no time here
+
+    if not is_wifi_connected:
+        print("Connect the Fall Detector to WiFi to start the Bike")
+        return False
+
+    # Sync the clock once and record when the bike was turned on; never retried,
+    # as this runs on every pass of the main loop
+    if not sync_attempted:
+        sync_attempted = True
+        if sync_time():
+            bike_start_time = current_time()
+        else:
+            print("Failed to get time at bike start. Time will be inaccurate.")
+            bike_start_time = None # Set to None to indicate no time.
+
+    return True
+
+
+
+def format_time(timestamp):
+    """Formats a timestamp into a human-readable string.
+
+    Args:
+        timestamp: The timestamp (seconds since epoch).
+
+    Returns:
+        A formatted time string.
+    """
+    local_time = time.localtime(timestamp)  # Use time
+    return "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(
+        local_time[0], local_time[1], local_time[2],
+        local_time[3], local_time[4], local_time[5]
+    )
+
+
+
+def peak_acceleration():
+    """
+    Gets the peak acceleration over the recent snapshots.
+
+    Returns:
+        The peak acceleration magnitude in m/s^2.
+    """
+    return max(s[1] for s in snapshots) ** 0.5 * 9.8
+
+
+
+def sensor_loop():
+    """
+    Samples the sensors on the second core and reports the first fall to the main loop.
+
+    Runs forever, once every SAMPLE_MS; the main core handles all network
+    I/O so WiFi or HTTP stalls never delay sampling.
+    """
+    global fall_event, fall_detected
+    _sleep_ms = time.sleep_ms
+    _ticks_ms = time.ticks_ms
+    _ticks_add = time.ticks_add
+    _ticks_diff = time.ticks_diff
+    _check = check_conditions
+    next_sample = _ticks_ms()
+    while True:
+        try:
+            met, acc_sq, gyro_sq, snd = _check()
+            if met and not fall_detected:  # Only the sensor core writes the latch
+                # Magnitudes are only needed for the alert, so take the roots once here
+                acc = acc_sq ** 0.5 * 9.8
+                gyro = gyro_sq ** 0.5
+                print(f"Accel: {acc:.2f}, Gyro: {gyro:.2f}, Sound: {snd}")
+                event = (acc, gyro, snd, peak_acceleration())  # Outside the lock
+                with fall_lock:
+                    fall_event = event
+                    fall_detected = True
+        except Exception as e:
+            # An uncaught error would end the thread and stop sensing for good
+            print("Error in sensor loop:", e)
+        next_sample = _ticks_add(next_sample, SAMPLE_MS)
+        idle = _ticks_diff(next_sample, _ticks_ms())
+        if idle > 0:
+            _sleep_ms(idle)
+        else:
+            next_sample = _ticks_ms()  # Running late, skip the missed samples
+
+
+
+def take_fall_event():
+    """
+    Takes the fall reported by sensor_loop, clearing it.
+
+    Returns:
+        A tuple containing the acceleration magnitude, gyroscope magnitude,
+        sound level and peak acceleration over the last second, or None if
+        no fall was reported.
+    """
+    global fall_event
+    with fall_lock:
+        event = fall_event
+        fall_event = None
+    return event
+
+
+
+def main():
+    """Runs the fall detection loop."""
+    # Bind hot globals and attributes to locals once; locals are much faster to look up
+    _sleep_ms = time.sleep_ms
+    _ticks_ms = time.ticks_ms
+    _ticks_add = time.ticks_add
+    _ticks_diff = time.ticks_diff
+    _now = current_time
+    _is_bike_on = is_bike_on
+    _take_fall = take_fall_event
+    _gps = get_gps_location
+    _alert = send_telegram_alert
+    _format = format_time
+    next_alert = _ticks_ms()
+    next_print = _ticks_ms()
+    sensing = False
+    gps_timer.init(period=GPS_POLL_MS, mode=Timer.PERIODIC, callback=poll_gps)
+
+    while True:
+        if _is_bike_on():
+            if not sensing:
+                _thread.start_new_thread(sensor_loop, ())
+                sensing = True
+            event = _take_fall()
+            if event:
+                acc, gyro, snd, peak_acc = event
+                # Pause status output instead of blocking the loop after the alert
+                next_alert = _ticks_add(_ticks_ms(), ALERT_COOLDOWN_MS)
+                loc = _gps()
+
+                # Get time when fall is detected
+                fall_time = _now()
+                if fall_time is None:
+                    print("Failed to get time at fall.")
+                    fall_time = None # Set to None
+                
+
+                if loc:
+                    lat, lon = loc
+                else:
+                    print("No recent GPS fix, using fallback location.")
+                    lat, lon = FALLBACK_LAT, FALLBACK_LON
+                msg = FALL_TEMPLATE.format(
+                    _format(bike_start_time) if bike_start_time else "Unknown",
+                    _format(fall_time) if fall_time else "Unknown",
+                    lat, lon, acc, peak_acc, gyro, snd,
+                )
+                print("Fall Detected")
+                _alert(msg)
+                start_buzzer()
+            elif _ticks_diff(_ticks_ms(), next_alert) >= 0 and _ticks_diff(_ticks_ms(), next_print) >= 0:
+                next_print = _ticks_add(_ticks_ms(), PRINT_MS)
+                cur_time = _now()
+                if cur_time is not None:
+                    print("Current Time:", _format(cur_time))
+                if not fall_detected:  # Sampling no longer reports after the alert
+                    print("Conditions not met.")
+
+            _sleep_ms(SAMPLE_MS)  # Pick up new fall events within one sample period
@@ -0,0 +1,5 @@
+# Freezes helmet_lib.py into a Pico W MicroPython firmware as bytecode.
+# From a MicroPython checkout, build with:
+#   make -C ports/rp2 BOARD=RPI_PICO_W FROZEN_MANIFEST=/path/to/this/manifest.py
+include("$(BOARD_DIR)/manifest.py")
+module("helmet_lib.py")